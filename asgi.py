@@ -0,0 +1,13 @@
+"""ASGI entry point for self-hosted deployments.
+
+Runs the dashboard through Streamlit's ASGI app so static assets get
+long-lived cache headers (see assets.StaticCacheMiddleware):
+
+    uvicorn asgi:app --host 0.0.0.0 --port 8501
+"""
+import streamlit as st
+from starlette.middleware import Middleware
+
+from assets import StaticCacheMiddleware
+
+app = st.App('AI_Risk_Dashboard.py', middleware=[Middleware(StaticCacheMiddleware)])
@@ -0,0 +1,113 @@
+"""Self-hosted static assets: fonts, logos and the dashboard stylesheet.
+
+Files under ``static/`` are served by Streamlit at ``app/static/...`` (see
+``server.enableStaticServing`` in ``.streamlit/config.toml``), so a page load
+makes no requests to external hosts.  Asset URLs carry a content-hash query
+string: a reverse proxy can cache ``app/static/`` as immutable, and a changed
+file still reaches browsers on the next deploy.
+
+The partner logos are not redistributed with the repository.  Run
+``python assets.py`` once on a machine with network access to vendor them into
+``static/logos`` before deploying somewhere air-gapped; until then the logo
+URLs fall back to the upstream hosts, and a warning is logged.  Asset URLs are
+worked out once per process, so files added later are picked up on restart.
+"""
+import hashlib
+import logging
+import urllib.request
+from functools import lru_cache
+from pathlib import Path
+
+logger = logging.getLogger(__name__)
+
+STATIC_DIR = Path(__file__).parent / 'static'
+STATIC_URL = 'app/static'
+STYLESHEET = 'css/dashboard.css'
+
+# Versioned URLs never change content; unversioned ones (the fonts the
+# stylesheet refers to) are revalidated daily
+IMMUTABLE_CACHE = b'public, max-age=31536000, immutable'
+DEFAULT_CACHE = b'public, max-age=86400'
+
+# Local path under static/ and the upstream URL each logo is vendored from
+LOGOS = {
+    'lse': (
+        'logos/lse.svg',
+        'https://upload.wikimedia.org/wikipedia/commons/c/c7/London_school_of_economics_logo_with_name.svg',
+    ),
+    'unu': (
+        'logos/unu-cpr.svg',
+        'https://unu.edu/sites/default/files/2023-03/UNU-CPR_LOGO_NV.svg',
+    ),
+}
+
+
+@lru_cache(maxsize=None)
+def asset_url(path, fallback=None):
+    """URL of ``static/<path>``, or ``fallback`` when the file is not bundled."""
+    file = STATIC_DIR / path
+    if not file.is_file():
+        if fallback is None:
+            raise FileNotFoundError(file)
+        logger.warning("%s is not bundled; browsers will load %s instead (run `python assets.py`)",
+                       file, fallback)
+        return fallback
+    digest = hashlib.sha256(file.read_bytes()).hexdigest()[:12]
+    return f"{STATIC_URL}/{path}?v={digest}"
+
+
+def logo_url(name):
+    path, upstream = LOGOS[name]
+    return asset_url(path, fallback=upstream)
+
+
+def stylesheet_tag():
+    """A ``<link>`` to the dashboard stylesheet, for ``st.markdown``.
+
+    Streamlit drops any element a rerun does not emit again, so the tag is
+    still sent on every rerun, but it is a few bytes instead of the whole
+    stylesheet, and the browser fetches and caches the CSS only once.
+    """
+    return f'<link rel="stylesheet" href="{asset_url(STYLESHEET)}">'
+
+
+def fetch_logos():
+    """Download the partner logos into ``static/logos``."""
+    for path, upstream in LOGOS.values():
+        target = STATIC_DIR / path
+        target.parent.mkdir(parents=True, exist_ok=True)
+        request = urllib.request.Request(upstream, headers={'User-Agent': 'airisk-dashboard asset fetch'})
+        with urllib.request.urlopen(request, timeout=30) as response:
+            target.write_bytes(response.read())
+        print(f"Saved {upstream} -> {target}")
+
+
+class StaticCacheMiddleware:
+    """ASGI middleware that sets ``Cache-Control`` on ``app/static`` responses."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or f"/{STATIC_URL}/" not in scope['path']:
+            await self.app(scope, receive, send)
+            return
+
+        versioned = b'v=' in scope.get('query_string', b'')
+        cache_control = IMMUTABLE_CACHE if versioned else DEFAULT_CACHE
+
+        async def send_with_cache_control(message):
+            if message['type'] == 'http.response.start' and message['status'] == 200:
+                headers = [
+                    (name, value) for name, value in message.get('headers', [])
+                    if name.lower() != b'cache-control'
+                ]
+                headers.append((b'cache-control', cache_control))
+                message = {**message, 'headers': headers}
+            await send(message)
+
+        await self.app(scope, receive, send_with_cache_control)
+
+
+if __name__ == '__main__':
+    fetch_logos()
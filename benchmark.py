@@ -0,0 +1,103 @@
+"""Benchmark the chart builders on synthetic datasets of growing size.
+
+Builds the comparison figures (category radar, per-category indicator radars
+and the indicator bars) for every size, once with the WebGL threshold from
+``charts`` and once with WebGL disabled, and reports build time,
+serialisation time, payload size and the trace types that were emitted.
+Browser render time cannot be measured from Python; payload size and the
+number of SVG traces are the proxies reported here.
+
+    python benchmark.py --companies 5 20 50 --indicators 10 50 250
+"""
+import argparse
+import time
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+import charts
+from risk_data import build_risk_data, compact_frame
+
+N_CATEGORIES = 4
+
+
+def synthetic_risk_data(n_companies, indicators_per_category, seed=0):
+    """A RiskData with random scores in the same shape as the CSV exports."""
+    rng = np.random.default_rng(seed)
+    companies = [f"Company {i + 1}" for i in range(n_companies)]
+    categories = [f"{i + 1}. Category {i + 1}" for i in range(N_CATEGORIES)]
+
+    indicator_rows = []
+    for c, category in enumerate(categories):
+        for i in range(indicators_per_category):
+            for company in companies:
+                value = rng.random()
+                indicator_rows.append(
+                    (category, f"{c + 1}.{i + 1:02d}", f"Indicator {c + 1}.{i + 1}", company, value, value * 100)
+                )
+    indicator_df = pd.DataFrame(indicator_rows, columns=[
+        'Risk Category', 'Risk ID', 'Risk Indicator', 'Company', 'Value', 'Standardized Value'
+    ])
+    category_df = (
+        indicator_df.groupby(['Risk Category', 'Company'], sort=False)['Standardized Value']
+        .mean().reset_index()
+    )
+    company_df = category_df.groupby('Company', sort=False)['Standardized Value'].mean().reset_index()
+    return build_risk_data(compact_frame(category_df), compact_frame(indicator_df), compact_frame(company_df))
+
+
+def build_figures(risk_data, webgl_threshold):
+    company_ids = list(risk_data.companies.index)
+    figures = [charts.category_radar(risk_data, company_ids, webgl_threshold)]
+    for category_id in risk_data.categories.index:
+        figures.append(charts.indicator_radar(risk_data, category_id, company_ids, webgl_threshold))
+    figures.append(charts.indicator_bars(risk_data, 0, company_ids, webgl_threshold))
+    return figures
+
+
+def measure(risk_data, webgl_threshold, repeat):
+    build_times, json_times = [], []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        figures = build_figures(risk_data, webgl_threshold)
+        build_times.append(time.perf_counter() - start)
+
+        start = time.perf_counter()
+        payloads = [fig.to_json() for fig in figures]
+        json_times.append(time.perf_counter() - start)
+
+    trace_types = Counter(trace.type for fig in figures for trace in fig.data)
+    return {
+        'build_ms': 1000 * min(build_times),
+        'json_ms': 1000 * min(json_times),
+        'payload_kb': sum(len(payload) for payload in payloads) / 1024,
+        'traces': ' '.join(f"{name}:{count}" for name, count in sorted(trace_types.items())),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--companies', type=int, nargs='+', default=[5, 20, 50])
+    parser.add_argument('--indicators', type=int, nargs='+', default=[10, 50, 250],
+                        help="indicators per category")
+    parser.add_argument('--threshold', type=int, default=charts.WEBGL_POINT_THRESHOLD,
+                        help="WebGL point threshold to compare against SVG-only rendering")
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"WebGL threshold: {args.threshold} points, max points per trace: {charts.MAX_POINTS_PER_TRACE}")
+    header = f"{'companies':>9} {'indicators':>10} {'mode':>5} {'build ms':>9} {'json ms':>8} {'payload KB':>10}  traces"
+    print(header)
+    print('-' * len(header))
+    for n_companies in args.companies:
+        for n_indicators in args.indicators:
+            risk_data = synthetic_risk_data(n_companies, n_indicators)
+            for mode, threshold in (('svg', float('inf')), ('auto', args.threshold)):
+                result = measure(risk_data, threshold, args.repeat)
+                print(f"{n_companies:>9} {n_indicators:>10} {mode:>5} {result['build_ms']:>9.1f} "
+                      f"{result['json_ms']:>8.1f} {result['payload_kb']:>10.1f}  {result['traces']}")
+
+
+if __name__ == '__main__':
+    main()
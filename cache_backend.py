@@ -0,0 +1,234 @@
+"""Cache backends that several app processes on one host can share.
+
+``st.cache_resource`` keeps one copy per process, so every replica behind a
+load balancer warms up on its own and holds its own copy of the data.  The
+backends here sit underneath it:
+
+``memory``
+    A per-process dict; the same behaviour as Streamlit's own cache.
+``disk``
+    One file per entry.  Numpy buffers are stored out-of-band (pickle
+    protocol 5) and loaded with ``mmap``, so the arrays of a loaded entry are
+    read-only views of the page cache that every process on the host shares.
+    Point it at ``/dev/shm`` for a shared-memory store.
+``sqlite``
+    One SQLite database (WAL mode) holding every entry; shared across
+    processes, but each process holds its own copy once loaded.
+
+Entries are unpickled, so anyone who can write to the cache directory could
+run code in the app.  The directory is created private to the app's user, and
+one that another user owns or can write to is refused.
+
+The backend is chosen with ``AIRISK_CACHE_BACKEND`` and its location with
+``AIRISK_CACHE_PATH``.  Keys carry a code version (the pandas and numpy
+versions and a hash of the modules that build the cached objects) and the
+dataset hash, so replicas never read an entry built by other code or from
+other data, and replicas of two releases running side by side during a
+rolling deploy keep separate entries.  Entries for older datasets are dropped
+when a new one is stored; entries left by older code stay until the cache is
+cleared.  An entry that cannot be read is treated as a miss.
+"""
+import hashlib
+import logging
+import mmap
+import os
+import pickle
+import sqlite3
+import struct
+import tempfile
+import threading
+from functools import lru_cache
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+import risk_data
+import sensitivity
+from risk_data import dataset_hash
+
+logger = logging.getLogger(__name__)
+
+# Version of the entry format written by `dumps`
+CACHE_VERSION = 2
+
+# Modules whose source decides what the cached objects contain
+_PRODUCERS = (risk_data, sensitivity)
+
+_MAGIC = b'AIRC'
+_HEADER = struct.Struct('<4sII')  # magic, format version, number of sections
+_ALIGN = 64
+
+
+def dumps(obj):
+    """Serialize ``obj`` with its large buffers stored out-of-band."""
+    buffers = []
+    stream = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    sections = [stream] + [buffer.raw() for buffer in buffers]
+
+    header = _HEADER.pack(_MAGIC, CACHE_VERSION, len(sections))
+    header += struct.pack(f'<{len(sections)}Q', *(len(section) for section in sections))
+    parts, offset = [header], len(header)
+    for section in sections:
+        padding = -offset % _ALIGN
+        parts.append(b'\0' * padding)
+        parts.append(section)
+        offset += padding + len(section)
+    return b''.join(parts)
+
+
+def loads(data):
+    """Inverse of :func:`dumps`; buffers are zero-copy views into ``data``."""
+    view = memoryview(data)
+    magic, version, n_sections = _HEADER.unpack_from(view)
+    if magic != _MAGIC or version != CACHE_VERSION:
+        raise ValueError("not a cache entry for this version")
+    lengths = struct.unpack_from(f'<{n_sections}Q', view, _HEADER.size)
+
+    sections, offset = [], _HEADER.size + 8 * n_sections
+    for length in lengths:
+        offset += -offset % _ALIGN
+        sections.append(view[offset:offset + length])
+        offset += length
+    return pickle.loads(sections[0], buffers=sections[1:])
+
+
+def _private_directory(directory):
+    """Create ``directory`` for this user only; refuse one others could write to."""
+    directory = Path(directory)
+    directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+    info = directory.stat()
+    # No ownership to check on Windows
+    if hasattr(os, 'getuid') and (info.st_uid != os.getuid() or info.st_mode & 0o022):
+        raise PermissionError(
+            f"cache directory {directory} must be owned by this user and not writable by others"
+        )
+    return directory
+
+
+def _load_or_miss(key, data):
+    """:func:`loads`, or None for an entry that cannot be loaded.
+
+    A truncated or corrupt entry, or one whose objects no longer unpickle
+    (``TypeError`` from ``__setstate__`` and the like), must not take the
+    page down: it is a miss, and the entry is overwritten once recomputed.
+    """
+    try:
+        return loads(data)
+    except Exception:
+        logger.warning("Ignoring unreadable cache entry %s", key, exc_info=True)
+        return None
+
+
+class MemoryBackend:
+    """Per-process cache."""
+
+    def __init__(self):
+        self._entries = {}
+
+    def get(self, key):
+        return self._entries.get(key)
+
+    def set(self, key, value):
+        self._entries[key] = value
+
+
+class DiskBackend:
+    """One memory-mapped file per entry in ``directory``."""
+
+    def __init__(self, directory):
+        self.directory = _private_directory(directory)
+
+    def _path(self, key):
+        return self.directory / f"{key}.cache"
+
+    def get(self, key):
+        try:
+            with open(self._path(key), 'rb') as file:
+                data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        except (FileNotFoundError, ValueError):
+            # Missing, or empty (mmap refuses empty files)
+            return None
+        return _load_or_miss(key, data)
+
+    def set(self, key, value):
+        # Write to a temporary file and rename, so readers never see a partial entry
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        with os.fdopen(fd, 'wb') as file:
+            file.write(dumps(value))
+        os.replace(tmp, self._path(key))
+
+        name = key.rsplit('-', 1)[0]
+        for stale in self.directory.glob(f"{name}-*.cache"):
+            if stale != self._path(key):
+                stale.unlink(missing_ok=True)
+
+
+class SQLiteBackend:
+    """Entries stored as blobs in one SQLite database."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        _private_directory(self.path.parent)
+        self._local = threading.local()
+        with self._connect() as db:
+            db.execute('PRAGMA journal_mode=WAL')
+            db.execute('CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, name TEXT, value BLOB)')
+
+    def _connect(self):
+        # sqlite3 connections cannot be shared between threads
+        if not hasattr(self._local, 'db'):
+            self._local.db = sqlite3.connect(self.path, timeout=30)
+        return self._local.db
+
+    def get(self, key):
+        row = self._connect().execute('SELECT value FROM cache WHERE key = ?', (key,)).fetchone()
+        if row is None:
+            return None
+        return _load_or_miss(key, row[0])
+
+    def set(self, key, value):
+        name = key.rsplit('-', 1)[0]
+        with self._connect() as db:
+            db.execute('INSERT OR REPLACE INTO cache VALUES (?, ?, ?)', (key, name, dumps(value)))
+            db.execute('DELETE FROM cache WHERE name = ? AND key != ?', (name, key))
+
+
+@lru_cache(maxsize=None)
+def code_version():
+    """Hash of everything besides the data that cached entries depend on."""
+    digest = hashlib.sha256(f"{CACHE_VERSION} {pd.__version__} {np.__version__}".encode())
+    for module in _PRODUCERS:
+        digest.update(Path(module.__file__).read_bytes())
+    return digest.hexdigest()[:12]
+
+
+@lru_cache(maxsize=None)
+def get_backend():
+    """The backend configured by ``AIRISK_CACHE_BACKEND``/``AIRISK_CACHE_PATH``."""
+    kind = os.environ.get('AIRISK_CACHE_BACKEND', 'memory')
+    default_dir = Path(tempfile.gettempdir()) / 'airisk-cache'
+    path = os.environ.get('AIRISK_CACHE_PATH')
+    if kind == 'memory':
+        return MemoryBackend()
+    if kind == 'disk':
+        return DiskBackend(path or default_dir)
+    if kind == 'sqlite':
+        return SQLiteBackend(path or default_dir / 'cache.db')
+    raise ValueError(f"Unknown AIRISK_CACHE_BACKEND {kind!r}; expected memory, disk or sqlite")
+
+
+def cached(name, variant, compute):
+    """Return the cached ``name`` for ``variant``, computing it on a miss.
+
+    The key is versioned with :func:`code_version` and the dataset hash, so
+    changed code, library versions or CSVs are a miss.  Only entries of the
+    same code version are pruned when a new one is stored.
+    """
+    backend = get_backend()
+    key = f"{name}.{variant}-{code_version()}-{dataset_hash(variant)}"
+    value = backend.get(key)
+    if value is None:
+        value = compute()
+        backend.set(key, value)
+    return value
@@ -0,0 +1,326 @@
+"""Plotly figure builders shared by the dashboard pages.
+
+Every builder takes a :class:`risk_data.RiskData` and the ids of the companies
+to plot.  When a figure would carry more than ``WEBGL_POINT_THRESHOLD`` points
+in total (traces x points per trace) it is drawn with WebGL trace types
+instead of SVG, and any trace longer than ``MAX_POINTS_PER_TRACE`` is
+aggregated into consecutive bins before it is sent to the browser.  Both
+limits can be overridden through the environment, e.g.
+``AIRISK_WEBGL_THRESHOLD=0`` forces WebGL everywhere.
+"""
+import os
+
+import numpy as np
+import plotly.graph_objects as go
+from plotly.subplots import make_subplots
+
+WEBGL_POINT_THRESHOLD = int(os.environ.get('AIRISK_WEBGL_THRESHOLD', 2000))
+MAX_POINTS_PER_TRACE = int(os.environ.get('AIRISK_MAX_POINTS_PER_TRACE', 200))
+
+COLOR_MAP = {
+    'Anthropic': '#da7756',
+    'Google DeepMind': '#4285F4',
+    'Meta AI': '#34b3f0',
+    'OpenAI': '#00A67E',
+    'xAI': '#000000'
+}
+DEFAULT_COLOR = '#7f8c8d'
+
+_LEGEND = dict(orientation="h", yanchor="bottom", y=-0.3, xanchor="center", x=0.5)
+
+
+def use_webgl(n_traces, n_points, threshold=None):
+    """Whether a figure of ``n_traces`` x ``n_points`` should be drawn with WebGL."""
+    if threshold is None:
+        threshold = WEBGL_POINT_THRESHOLD
+    return n_traces * n_points > threshold
+
+
+def decimate(values, labels, max_points=None):
+    """Average runs of consecutive points so at most ``max_points`` remain.
+
+    Missing values are ignored within a bin; each bin is labelled with the
+    first and last label it covers.
+    """
+    if max_points is None:
+        max_points = MAX_POINTS_PER_TRACE
+    n = len(values)
+    if n <= max_points:
+        return values, labels
+
+    size = -(-n // max_points)
+    starts = np.arange(0, n, size)
+    ends = np.minimum(starts + size, n) - 1
+    values = np.asarray(values, dtype=np.float64)
+    present = ~np.isnan(values)
+    sums = np.add.reduceat(np.where(present, values, 0.0), starts)
+    counts = np.add.reduceat(present.astype(np.int64), starts)
+    means = np.divide(sums, counts, out=np.full(len(starts), np.nan), where=counts > 0)
+    binned = [
+        labels[start] if start == end else f"{labels[start]} – {labels[end]}"
+        for start, end in zip(starts, ends)
+    ]
+    return means, np.asarray(binned, dtype=object)
+
+
+def _binned_hover(value, label):
+    """Hover template for a decimated trace, whose points are bin means."""
+    return f"%{{fullData.name}}<br>%{{{label}}}<br>Mean score of the bin: %{{{value}:.1f}}<extra></extra>"
+
+
+def _decimate_trace(webgl, values, labels, value_axis, label_axis):
+    """Values, labels and hover template of one trace, decimated on the WebGL path.
+
+    The hover template is None unless the trace was binned, so unbinned
+    traces keep plotly's default hover.
+    """
+    if not webgl:
+        return values, labels, None
+    n = len(values)
+    values, labels = decimate(values, labels)
+    hovertemplate = _binned_hover(value_axis, label_axis) if len(values) < n else None
+    return values, labels, hovertemplate
+
+
+def _company_rows(frame, company_ids):
+    """Yield ``(company_id, rows)`` for each selected company, in order."""
+    for company_id in company_ids:
+        yield company_id, frame[frame['company_id'] == company_id]
+
+
+def _points_per_trace(frame, key):
+    return frame[key].nunique() if len(frame) else 0
+
+
+def _polar_trace(webgl, **kwargs):
+    return go.Scatterpolargl(**kwargs) if webgl else go.Scatterpolar(**kwargs)
+
+
+def gauge(company, score, n_companies):
+    """Gauge of one company's overall risk score."""
+    fig = go.Figure(go.Indicator(
+        mode="gauge+number",
+        value=score,
+        title={'text': f"{company}"},
+        gauge={
+            'axis': {'range': [0, 100]},
+            'bar': {'color': "whitesmoke"},
+            'steps': [
+                {'range': [0, 33], 'color': '#008450'},
+                {'range': [33, 66], 'color': '#EFB700'},
+                {'range': [66, 100], 'color': '#B81D13'}
+            ],
+            'threshold': {
+                'line': {'color': 'whitesmoke', 'width': 4},
+                'thickness': 0.69,
+                'value': score
+            }
+        }
+    ))
+    fig.update_layout(
+        width=300 * n_companies,
+        height=300,
+        margin=dict(t=0, b=0),
+        font={'family': 'Roboto', 'color': '#454545'}
+    )
+    return fig
+
+
+def category_radar(risk_data, company_ids, webgl_threshold=None):
+    """Overlaid radar of every selected company's category scores."""
+    company_names = risk_data.companies['name'].to_numpy()
+    category_labels = risk_data.categories['label'].to_numpy()
+    scores = risk_data.category_scores
+    webgl = use_webgl(len(company_ids), _points_per_trace(scores, 'category_id'), webgl_threshold)
+
+    fig = go.Figure()
+    for company_id, company_data in _company_rows(scores, company_ids):
+        company = company_names[company_id]
+        r, theta, hovertemplate = _decimate_trace(
+            webgl, company_data['score'].to_numpy(), category_labels[company_data['category_id']], 'r', 'theta'
+        )
+        fig.add_trace(_polar_trace(
+            webgl,
+            r=r,
+            theta=theta,
+            hovertemplate=hovertemplate,
+            fill='toself',
+            name=company,
+            line=dict(color=COLOR_MAP.get(company, DEFAULT_COLOR), width=2)
+        ))
+
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(range=[0, 100]),
+            angularaxis=dict(rotation=90)
+        ),
+        height=500,
+        legend=_LEGEND,
+        margin=dict(t=40)
+    )
+    return fig
+
+
+def indicator_radar(risk_data, category_id, company_ids, webgl_threshold=None):
+    """Overlaid radar of the selected companies' indicator scores in one category."""
+    company_names = risk_data.companies['name'].to_numpy()
+    indicator_names = risk_data.indicators['name'].to_numpy()
+    scores = risk_data.indicator_scores
+    category_data = scores[scores['category_id'] == category_id]
+    webgl = use_webgl(len(company_ids), _points_per_trace(category_data, 'indicator_id'), webgl_threshold)
+
+    fig = go.Figure()
+    for company_id, company_data in _company_rows(category_data, company_ids):
+        company = company_names[company_id]
+        r, theta, hovertemplate = _decimate_trace(
+            webgl, company_data['score'].to_numpy(), indicator_names[company_data['indicator_id']], 'r', 'theta'
+        )
+        fig.add_trace(_polar_trace(
+            webgl,
+            r=r,
+            theta=theta,
+            hovertemplate=hovertemplate,
+            connectgaps=True,
+            fill='toself',
+            name=company,
+            line=dict(color=COLOR_MAP.get(company, DEFAULT_COLOR)),
+            hoverlabel=dict(font={'family': 'Roboto'})
+        ))
+
+    fig.update_layout(
+        polar=dict(
+            radialaxis=dict(range=[0, 100]),
+            angularaxis=dict(rotation=90)
+        ),
+        title=risk_data.categories.at[category_id, 'name'],
+        legend=_LEGEND,
+        height=500,
+        margin=dict(t=60)
+    )
+    return fig
+
+
+def company_radars(risk_data, company_ids, webgl_threshold=None):
+    """One small category radar per selected company, side by side."""
+    company_names = risk_data.companies['name'].to_numpy()
+    short_labels = risk_data.categories['short_label'].to_numpy()
+    scores = risk_data.category_scores
+    n_companies = len(company_ids)
+    webgl = use_webgl(n_companies, _points_per_trace(scores, 'category_id'), webgl_threshold)
+
+    fig = make_subplots(
+        rows=1,
+        cols=n_companies,
+        specs=[[{'type': 'polar'}] * n_companies],
+        subplot_titles=list(company_names[list(company_ids)])
+    )
+    for i, (company_id, company_data) in enumerate(_company_rows(scores, company_ids)):
+        company = company_names[company_id]
+        r, theta, hovertemplate = _decimate_trace(
+            webgl, company_data['score'].to_numpy(), short_labels[company_data['category_id']], 'r', 'theta'
+        )
+        fig.add_trace(_polar_trace(
+            webgl,
+            r=r,
+            theta=theta,
+            hovertemplate=hovertemplate,
+            connectgaps=True,
+            fill='toself',
+            line=dict(color=COLOR_MAP.get(company, DEFAULT_COLOR)),
+            name=company
+        ), 1, i + 1)
+    # Adjust the position of the subplot titles
+    for annotation in fig['layout']['annotations']:
+        annotation['y'] += 0.3
+
+    for j in range(1, n_companies + 1):
+        fig.update_layout(**{f'polar{j}': dict(
+            radialaxis=dict(visible=True, range=[0, 100]),
+            angularaxis=dict(rotation=90))
+        })
+
+    fig.update_layout(
+        width=200 * n_companies,
+        height=200 + 300 / n_companies,
+        showlegend=False,
+        font={'family': 'Roboto', 'color': '#454545'},
+        margin=dict(t=60)
+    )
+    return fig
+
+
+def indicator_bars(risk_data, category_id, company_ids, webgl_threshold=None):
+    """Grouped horizontal bars of indicator scores in one category.
+
+    Above the WebGL threshold the bars become a WebGL dot plot, since plotly
+    has no WebGL bar trace; when indicators are binned, each dot is the mean
+    score of its bin, as the hover text and axis title say.
+    """
+    company_names = risk_data.companies['name'].to_numpy()
+    indicator_names = risk_data.indicators['name'].to_numpy()
+    scores = risk_data.indicator_scores
+    category_data = scores[scores['category_id'] == category_id]
+    webgl = use_webgl(len(company_ids), _points_per_trace(category_data, 'indicator_id'), webgl_threshold)
+
+    fig = go.Figure()
+    binned = False
+    for company_id, company_data in _company_rows(category_data, company_ids):
+        company = company_names[company_id]
+        color = COLOR_MAP.get(company, DEFAULT_COLOR)
+        x, y = company_data['score'].to_numpy(), indicator_names[company_data['indicator_id']]
+        if webgl:
+            x, y, hovertemplate = _decimate_trace(webgl, x, y, 'x', 'y')
+            binned = binned or hovertemplate is not None
+            fig.add_trace(go.Scattergl(
+                x=x, y=y, name=company, mode='markers', marker=dict(color=color), hovertemplate=hovertemplate
+            ))
+        else:
+            fig.add_trace(go.Bar(x=x, y=y, name=company, orientation='h', marker=dict(color=color)))
+
+    if not webgl:
+        fig.update_layout(barmode='group')
+    fig.update_layout(
+        height=500,
+        xaxis_title="Mean Risk Score per bin of indicators" if binned else "Risk Score",
+        yaxis_title="Indicators (binned)" if binned else "Indicator",
+        margin=dict(l=150)
+    )
+    return fig
+
+
+def tornado(risk_data, sensitivity, company_id, level='indicators', top=None):
+    """Change in one company's index when each indicator (or category) is left out.
+
+    Bars are sorted by the size of the change, largest at the top (only the
+    ``top`` largest when given); items whose removal changes the company's
+    rank are labelled with the rank move.
+    """
+    rows = getattr(sensitivity, level)
+    rows = rows[(rows['company_id'] == company_id) & rows['delta'].notna()]
+    rows = rows.reindex(rows['delta'].abs().sort_values(ascending=False).index[:top])[::-1]
+
+    if level == 'indicators':
+        labels = risk_data.indicators['label'].to_numpy()[rows['indicator_id'].to_numpy()]
+    else:
+        labels = risk_data.categories['label'].to_numpy()[rows['category_id'].to_numpy()]
+    flips = [
+        f"rank {base} → {rank}" if flip else ''
+        for base, rank, flip in zip(rows['base_rank'], rows['rank'], rows['rank_flip'])
+    ]
+
+    fig = go.Figure(go.Bar(
+        x=rows['delta'],
+        y=labels,
+        orientation='h',
+        text=flips,
+        textposition='outside',
+        marker=dict(color=np.where(rows['delta'] > 0, '#B81D13', '#008450')),
+        hovertemplate="%{y}<br>Index change: %{x:+.2f}<extra></extra>"
+    ))
+    fig.update_layout(
+        height=max(300, 30 * len(rows) + 120),
+        xaxis_title="Change in risk index when left out",
+        margin=dict(l=150),
+        font={'family': 'Roboto', 'color': '#454545'}
+    )
+    return fig
@@ -0,0 +1,107 @@
+"""Company selection applied in the browser instead of by a rerun.
+
+With ``AIRISK_CLIENT_SELECTION=1`` the pages replace the company multiselect
+with :func:`company_selector` and draw the comparison charts with
+:func:`plotly_chart`.  Every chart is then sent once with a trace for every
+company; toggling a company only changes trace visibility in the browser
+(``Plotly.restyle``), so it costs no rerun, no server CPU and no payload.
+
+The selector and the charts are instances of one small custom component
+(``components/company_selection``).  The instances of a session share the
+selection over a ``BroadcastChannel`` and keep it in ``sessionStorage``, so a
+chart that is redrawn after another widget's rerun comes back with the
+selection the reader left it in.
+
+The charts load plotly.js from the component directory, so it works
+air-gapped.  The app never writes it at runtime (the image may be read-only):
+copy it from the installed ``plotly`` package at build time with
+``python company_selection.py``.  Without an up-to-date copy the pages fall
+back to the multiselect and a warning is logged.
+"""
+import logging
+import os
+import tempfile
+import uuid
+from pathlib import Path
+
+import streamlit as st
+import streamlit.components.v1 as components
+from plotly.offline import get_plotlyjs, get_plotlyjs_version
+
+from charts import COLOR_MAP, DEFAULT_COLOR
+
+logger = logging.getLogger(__name__)
+
+FRONTEND_DIR = Path(__file__).parent / 'components' / 'company_selection'
+PLOTLYJS = FRONTEND_DIR / 'plotly.min.js'
+DEFAULT_HEIGHT = 450
+
+_component = components.declare_component('company_selection', path=str(FRONTEND_DIR))
+
+
+def plotlyjs_ready():
+    """Whether the component has a copy of the installed plotly.js version."""
+    try:
+        with open(PLOTLYJS, encoding='utf-8') as file:
+            header = file.read(200)
+    except OSError:
+        return False
+    return f"plotly.js v{get_plotlyjs_version()}\n" in header
+
+
+def bundle_plotlyjs():
+    """Copy the installed plotly.js next to the component; a build step."""
+    # Write to a temporary file and rename, so the server never serves a partial file
+    fd, tmp = tempfile.mkstemp(dir=FRONTEND_DIR, suffix='.tmp')
+    with os.fdopen(fd, 'w', encoding='utf-8') as file:
+        file.write(get_plotlyjs())
+    os.chmod(tmp, 0o644)
+    os.replace(tmp, PLOTLYJS)
+
+
+ENABLED = os.environ.get('AIRISK_CLIENT_SELECTION', '0') == '1'
+if ENABLED and not plotlyjs_ready():
+    logger.warning("AIRISK_CLIENT_SELECTION is set but %s is missing or out of date; "
+                   "run `python company_selection.py`. Selecting companies on the server instead.", PLOTLYJS)
+    ENABLED = False
+
+
+def _channel():
+    """Name of the channel this session's selector and charts share."""
+    if 'company_selection_channel' not in st.session_state:
+        st.session_state.company_selection_channel = uuid.uuid4().hex
+    return st.session_state.company_selection_channel
+
+
+def company_selector(label, company_names, help=None):
+    """Toggle buttons for ``company_names``; all selected until changed."""
+    companies = list(company_names)
+    _component(
+        label=label,
+        help=help,
+        companies=companies,
+        colors=[COLOR_MAP.get(company, DEFAULT_COLOR) for company in companies],
+        channel=_channel(),
+        default=None,
+    )
+
+
+def plotly_chart(fig, company_names):
+    """Draw ``fig``, showing only the traces of the selected companies.
+
+    Traces are matched to companies by name; a subplot whose traces are all
+    hidden (one radar per company) is hidden with them.  Traces named after
+    no company are always shown.
+    """
+    _component(
+        figure=fig.to_json(),
+        height=fig.layout.height or DEFAULT_HEIGHT,
+        companies=list(company_names),
+        channel=_channel(),
+        default=None,
+    )
+
+
+if __name__ == '__main__':
+    bundle_plotlyjs()
+    print(f"Saved plotly.js v{get_plotlyjs_version()} -> {PLOTLYJS}")
@@ -0,0 +1,200 @@
+// Company selector and comparison charts that share one selection in the
+// browser (see company_selection.py).  Speaks Streamlit's component protocol
+// directly over postMessage, so there is no build step.  Nothing is ever sent
+// back to Streamlit: a selection change never triggers a rerun.
+
+const root = document.getElementById('root');
+
+let channelName = null;
+let channel = null;
+let companies = [];
+let onSelection = () => {};
+
+function sendToStreamlit(type, data) {
+    window.parent.postMessage({isStreamlitMessage: true, type: type, ...data}, '*');
+}
+
+function setFrameHeight(height) {
+    sendToStreamlit('streamlit:setFrameHeight', {height: height});
+}
+
+// ---------- Shared selection ----------
+
+function storageKey() {
+    return 'airisk-company-selection-' + channelName;
+}
+
+function loadSelection() {
+    try {
+        const saved = sessionStorage.getItem(storageKey());
+        if (saved !== null) {
+            return JSON.parse(saved);
+        }
+    } catch (error) {
+        // Storage disabled: every instance starts with all companies
+    }
+    return companies;
+}
+
+function publishSelection(selection) {
+    try {
+        sessionStorage.setItem(storageKey(), JSON.stringify(selection));
+    } catch (error) {
+        // The channel below still reaches the instances that are mounted
+    }
+    channel.postMessage(selection);
+}
+
+function connect(name) {
+    if (name === channelName) {
+        return;
+    }
+    if (channel !== null) {
+        channel.close();
+    }
+    channelName = name;
+    channel = new BroadcastChannel('airisk-company-selection-' + name);
+    channel.onmessage = (event) => onSelection(event.data);
+}
+
+// ---------- Selector ----------
+
+function renderSelector(args) {
+    let selection = loadSelection();
+    root.replaceChildren();
+
+    const label = document.createElement('div');
+    label.className = 'label';
+    label.textContent = args.label;
+    if (args.help) {
+        label.title = args.help;
+    }
+
+    const buttons = document.createElement('div');
+    buttons.className = 'companies';
+    const update = () => {
+        for (const button of buttons.children) {
+            const selected = selection.includes(button.dataset.company);
+            button.classList.toggle('selected', selected);
+            button.setAttribute('aria-pressed', selected);
+        }
+    };
+
+    args.companies.forEach((company, i) => {
+        const button = document.createElement('button');
+        button.className = 'company';
+        button.dataset.company = company;
+        const swatch = document.createElement('span');
+        swatch.className = 'swatch';
+        swatch.style.background = args.colors[i];
+        button.append(swatch, company);
+        button.addEventListener('click', () => {
+            // Keep the companies in their original order
+            selection = selection.includes(company)
+                ? selection.filter((other) => other !== company)
+                : args.companies.filter((other) => other === company || selection.includes(other));
+            update();
+            publishSelection(selection);
+        });
+        buttons.append(button);
+    });
+
+    onSelection = (selected) => {
+        selection = selected;
+        update();
+    };
+    update();
+    root.append(label, buttons);
+    setFrameHeight(document.body.scrollHeight);
+}
+
+// ---------- Charts ----------
+
+let plotlyLoaded = null;
+
+function loadPlotly() {
+    // Only charts need plotly.js, so the selector does not load it
+    if (plotlyLoaded === null) {
+        plotlyLoaded = new Promise((resolve, reject) => {
+            const script = document.createElement('script');
+            script.src = 'plotly.min.js';
+            script.onload = resolve;
+            script.onerror = reject;
+            document.head.append(script);
+        });
+    }
+    return plotlyLoaded;
+}
+
+function applySelection(chart, selection) {
+    const visible = chart.data.map(
+        (trace) => !companies.includes(trace.name) || selection.includes(trace.name)
+    );
+    Plotly.restyle(chart, {visible: visible});
+
+    // One subplot per company: hide each subplot whose traces are all hidden
+    const layout = {};
+    const subplots = new Map();
+    chart.data.forEach((trace, i) => {
+        if (trace.subplot) {
+            subplots.set(trace.subplot, (subplots.get(trace.subplot) || false) || visible[i]);
+        }
+    });
+    if (subplots.size > 1) {
+        for (const [subplot, shown] of subplots) {
+            layout[subplot + '.radialaxis.visible'] = shown;
+            layout[subplot + '.angularaxis.visible'] = shown;
+            layout[subplot + '.bgcolor'] = shown ? chart.backgrounds[subplot] : 'rgba(0,0,0,0)';
+        }
+        (chart.layout.annotations || []).forEach((annotation, i) => {
+            if (companies.includes(annotation.text)) {
+                layout['annotations[' + i + '].visible'] = selection.includes(annotation.text);
+            }
+        });
+        Plotly.relayout(chart, layout);
+    }
+}
+
+async function renderChart(args) {
+    await loadPlotly();
+    const figure = JSON.parse(args.figure);
+    // Fill the width of the column, like st.plotly_chart(use_container_width=True)
+    delete figure.layout.width;
+    figure.layout.autosize = true;
+    figure.layout.height = args.height;
+
+    let chart = root.firstElementChild;
+    if (chart === null) {
+        chart = document.createElement('div');
+        root.append(chart);
+    }
+    await Plotly.react(chart, figure.data, figure.layout, {responsive: true, displaylogo: false});
+    // Subplot backgrounds as drawn, to restore when a hidden subplot is shown
+    chart.backgrounds = {};
+    for (const trace of chart.data) {
+        if (trace.subplot) {
+            chart.backgrounds[trace.subplot] = chart._fullLayout[trace.subplot].bgcolor;
+        }
+    }
+    onSelection = (selection) => applySelection(chart, selection);
+    applySelection(chart, loadSelection());
+    setFrameHeight(args.height);
+}
+
+// ---------- Streamlit component protocol ----------
+
+window.addEventListener('message', (event) => {
+    if (event.data.type !== 'streamlit:render') {
+        return;
+    }
+    const args = event.data.args;
+    companies = args.companies;
+    connect(args.channel);
+    if (args.figure) {
+        renderChart(args);
+    } else {
+        renderSelector(args);
+    }
+});
+
+sendToStreamlit('streamlit:componentReady', {apiVersion: 1});
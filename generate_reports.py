@@ -0,0 +1,216 @@
+"""Generate a static risk report for every company in the dataset.
+
+Each company gets ``<out>/<variant>/<company>/report.html`` with its gauge,
+category radar, indicator bars and score tables, all sharing one offline copy
+of plotly.js; ``--images`` also exports every figure as PNG (requires the
+optional ``kaleido`` package).  Reports are built in a process pool, and a
+company is skipped when the content hash of its inputs matches the one
+recorded in ``<out>/<variant>/manifest.json`` by the previous run.
+
+    python generate_reports.py --variant std --out reports --workers 8
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import plotly
+import plotly.io as pio
+from plotly.offline import get_plotlyjs
+
+import charts
+from risk_data import DATASETS, load_risk_data
+
+# Bump when the report layout changes so every report is rebuilt
+REPORT_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+PLOTLYJS_NAME = 'plotly.min.js'
+
+_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{company} - AI Risk Report</title>
+<script src="../{plotlyjs}"></script>
+<style>
+    body {{ font-family: 'Roboto', sans-serif; color: #454545; margin: 2rem; }}
+    h1 {{ color: #2c3e50; }}
+    h2 {{ border-bottom: 2px solid #009edb; padding-bottom: 0.3rem; color: #2c3e50; }}
+    .dataframe {{ border-collapse: collapse; margin-bottom: 1.5rem; }}
+    .dataframe th {{ background-color: #009edb; color: white; padding: 0.3rem 0.6rem; }}
+    .dataframe td {{ padding: 0.3rem 0.6rem; border-bottom: 1px solid #e4effb; }}
+</style>
+</head>
+<body>
+<h1>{company}</h1>
+<p>Competitive Dynamics Risk Report ({variant} dataset)</p>
+{body}
+</body>
+</html>
+"""
+
+# Each worker process loads the dataset once in its initializer
+_risk_data = None
+
+
+def _init_worker(variant):
+    global _risk_data
+    _risk_data = load_risk_data(variant)
+
+
+def slugify(name):
+    return re.sub(r'[^a-z0-9]+', '-', name.lower()).strip('-')
+
+
+def company_inputs(risk_data, company_id):
+    """The rows a company's report is built from, as plain Python data."""
+    scores = risk_data.company_scores
+    category_scores = risk_data.category_scores
+    indicator_scores = risk_data.indicator_scores
+    categories = category_scores[category_scores['company_id'] == company_id]
+    indicators = indicator_scores[indicator_scores['company_id'] == company_id]
+    return {
+        'company': risk_data.companies.at[company_id, 'name'],
+        'score': scores.loc[scores['company_id'] == company_id, 'score'].tolist(),
+        'categories': [
+            [risk_data.categories.at[category_id, 'name'], score]
+            for category_id, score in zip(categories['category_id'], categories['score'].tolist())
+        ],
+        'indicators': [
+            [risk_data.indicators.at[indicator_id, 'risk_id'], risk_data.indicators.at[indicator_id, 'name'],
+             value, score]
+            for indicator_id, value, score in zip(
+                indicators['indicator_id'], indicators['value'].tolist(), indicators['score'].tolist()
+            )
+        ],
+    }
+
+
+def content_hash(inputs, images):
+    # The plotly version changes the figure JSON and the shared plotly.js
+    payload = json.dumps([REPORT_VERSION, plotly.__version__, images, inputs], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def report_figures(risk_data, company_id):
+    """``(name, figure)`` pairs that make up one company's report."""
+    company = risk_data.companies.at[company_id, 'name']
+    scores = risk_data.company_scores
+    score = scores.loc[scores['company_id'] == company_id, 'score'].iloc[0]
+
+    figures = [
+        ('gauge', charts.gauge(company, score, 1)),
+        ('category_radar', charts.category_radar(risk_data, [company_id])),
+    ]
+    for category_id in risk_data.categories.index:
+        fig = charts.indicator_bars(risk_data, category_id, [company_id])
+        fig.update_layout(title=risk_data.categories.at[category_id, 'name'], showlegend=False)
+        figures.append((f"indicators_{risk_data.categories.at[category_id, 'number']}", fig))
+    return figures
+
+
+def report_tables(risk_data, company_id):
+    table = risk_data.indicator_table
+    indicators = table[table['Company'] == risk_data.companies.at[company_id, 'name']]
+    categories = risk_data.category_table
+    categories = categories[categories['Company'] == risk_data.companies.at[company_id, 'name']]
+    return [
+        ('Category Scores', categories.drop(columns='Company')),
+        ('Indicator Scores', indicators.drop(columns='Company')),
+    ]
+
+
+def build_report(company_id, out_dir, variant, images):
+    """Write one company's report; runs inside a worker process."""
+    risk_data = _risk_data
+    company = risk_data.companies.at[company_id, 'name']
+    company_dir = Path(out_dir) / slugify(company)
+    company_dir.mkdir(parents=True, exist_ok=True)
+
+    sections = []
+    for name, fig in report_figures(risk_data, company_id):
+        sections.append(pio.to_html(fig, include_plotlyjs=False, full_html=False, div_id=name))
+        if images:
+            fig.write_image(company_dir / f"{name}.png", width=900, height=500)
+    for title, frame in report_tables(risk_data, company_id):
+        sections.append(f"<h2>{title}</h2>\n" + frame.to_html(index=False, float_format='%.2f', na_rep=''))
+
+    html = _PAGE.format(company=company, variant=variant, plotlyjs=PLOTLYJS_NAME, body='\n'.join(sections))
+    (company_dir / 'report.html').write_text(html, encoding='utf-8')
+    return company_id
+
+
+def load_manifest(out_dir):
+    path = Path(out_dir) / MANIFEST_NAME
+    if not path.exists():
+        return {}
+    return json.loads(path.read_text(encoding='utf-8'))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--variant', choices=sorted(DATASETS), default='std')
+    parser.add_argument('--out', type=Path, default=Path('reports'))
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--images', action='store_true', help="also export each figure as PNG (needs kaleido)")
+    parser.add_argument('--force', action='store_true', help="rebuild reports whose inputs have not changed")
+    args = parser.parse_args()
+
+    if args.images:
+        try:
+            import kaleido  # noqa: F401
+        except ImportError:
+            parser.error("--images needs the kaleido package: pip install kaleido")
+
+    start = time.perf_counter()
+    out_dir = args.out / args.variant
+    out_dir.mkdir(parents=True, exist_ok=True)
+    # Refresh the shared bundle when plotly was upgraded since the last run
+    plotlyjs, bundle = out_dir / PLOTLYJS_NAME, get_plotlyjs()
+    if not plotlyjs.exists() or plotlyjs.read_text(encoding='utf-8') != bundle:
+        plotlyjs.write_text(bundle, encoding='utf-8')
+
+    risk_data = load_risk_data(args.variant)
+    manifest = {} if args.force else load_manifest(out_dir)
+    hashes, pending = {}, []
+    for company_id, company in risk_data.companies['name'].items():
+        slug = slugify(company)
+        hashes[slug] = content_hash(company_inputs(risk_data, company_id), args.images)
+        if manifest.get(slug) != hashes[slug] or not (out_dir / slug / 'report.html').exists():
+            pending.append(company_id)
+
+    print(f"{len(pending)} of {len(hashes)} reports to build, {len(hashes) - len(pending)} unchanged")
+    built = {}
+    if pending:
+        with ProcessPoolExecutor(
+            max_workers=min(args.workers, len(pending)),
+            initializer=_init_worker,
+            initargs=(args.variant,),
+        ) as pool:
+            futures = {
+                pool.submit(build_report, company_id, out_dir, args.variant, args.images): company_id
+                for company_id in pending
+            }
+            for future in as_completed(futures):
+                slug = slugify(risk_data.companies.at[futures[future], 'name'])
+                try:
+                    future.result()
+                except Exception as exc:
+                    print(f"  failed {slug}: {exc!r}")
+                    continue
+                built[slug] = hashes[slug]
+                print(f"  built {out_dir / slug / 'report.html'}")
+
+    # Failed reports keep their old hash (or none), so the next run retries them
+    manifest = {slug: digest for slug, digest in manifest.items() if slug in hashes}
+    manifest.update(built)
+    (out_dir / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding='utf-8')
+    print(f"Done in {time.perf_counter() - start:.1f}s")
+
+
+if __name__ == '__main__':
+    main()
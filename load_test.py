@@ -0,0 +1,297 @@
+"""Simulate many concurrent dashboard sessions and report rerun latency.
+
+Each simulated session is a websocket client speaking Streamlit's own
+protocol to a running server, exactly as a browser tab does: it opens one of
+the page scripts and replays a realistic interaction script (pick a subset of
+companies, pick a risk category, pick a company for the sensitivity analysis,
+restore the full selection), pausing between actions like a reader would.
+Tab switches happen in the browser without contacting the server, so they
+only show up as that think time.  Each rerun is timed from the request to the
+server's "script finished" message, and the server's RSS is sampled while the
+sessions run.
+
+By default a headless server is started for the run:
+
+    python load_test.py --sessions 30 --iterations 5 --ramp 10
+
+or point the tool at one that is already running (``--pid`` enables the RSS
+samples, which are read from ``/proc`` and so need the same host):
+
+    python load_test.py --url http://localhost:8501 --pid 12345
+"""
+import argparse
+import asyncio
+import random
+import resource
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import defaultdict
+from pathlib import Path
+
+import numpy as np
+import websockets
+from streamlit.proto.BackMsg_pb2 import BackMsg
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg
+
+ROOT = Path(__file__).parent
+
+# Page script -> URL path Streamlit serves it under
+PAGES = {
+    'AI_Risk_Dashboard.py': '',
+    'pages/Extended_Version.py': 'Extended_Version',
+}
+WIDGET_TYPES = {'multiselect', 'selectbox', 'radio'}
+
+
+def rss_mb(pid):
+    """Resident set size of process ``pid``, in MB, or None without ``/proc``."""
+    try:
+        with open(f'/proc/{pid}/statm') as statm:
+            pages = int(statm.read().split()[1])
+    except OSError:
+        return None
+    return pages * resource.getpagesize() / 2**20
+
+
+class Session:
+    """One browser tab: a websocket connection and the state of its widgets."""
+
+    def __init__(self, url, page_name, timeout):
+        self.url = url.rstrip('/').replace('http', 'ws', 1) + '/_stcore/stream'
+        self.page_name = page_name
+        self.timeout = timeout
+        # Widget label -> {'id', 'type', 'options', 'value'}
+        self.widgets = {}
+        # Cacheable messages by hash; the server sends a reference instead of
+        # a message the client reports it already has, as browsers do
+        self._cached = {}
+
+    async def __aenter__(self):
+        self.ws = await websockets.connect(
+            self.url, subprotocols=['streamlit'], max_size=None, ping_interval=None
+        )
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.ws.close()
+
+    def options(self, label):
+        return self.widgets[label]['options']
+
+    def _record_widget(self, kind, proto):
+        known = self.widgets.get(proto.label)
+        if proto.set_value:
+            value = list(proto.raw_values) if kind == 'multiselect' else proto.raw_value
+        elif known is not None and known['id'] == proto.id:
+            value = known['value']
+        elif kind == 'multiselect':
+            value = [proto.options[i] for i in proto.default]
+        else:
+            value = proto.options[proto.default]
+        self.widgets[proto.label] = {
+            'id': proto.id, 'type': kind, 'options': list(proto.options), 'value': value,
+        }
+
+    async def rerun(self, **changes):
+        """Set the widgets labelled by ``changes`` and rerun the page.
+
+        Returns the seconds until the script finished and the bytes received.
+        """
+        for label, value in changes.items():
+            self.widgets[label]['value'] = value
+
+        msg = BackMsg()
+        state = msg.rerun_script
+        # The page is resolved from its URL path on every rerun
+        state.page_name = self.page_name
+        # Like the browser, send every widget's value, not just the changed ones
+        for widget in self.widgets.values():
+            widget_state = state.widget_states.widgets.add(id=widget['id'])
+            if widget['type'] == 'multiselect':
+                widget_state.string_array_value.data[:] = widget['value']
+            else:
+                widget_state.string_value = widget['value']
+        state.cached_message_hashes.extend(self._cached)
+
+        start = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        received = 0
+        async with asyncio.timeout(self.timeout):
+            while True:
+                data = await self.ws.recv()
+                received += len(data)
+                forward = ForwardMsg.FromString(data)
+                if forward.HasField('ref_hash'):
+                    forward = self._cached[forward.ref_hash]
+                elif forward.metadata.cacheable:
+                    self._cached[forward.hash] = forward
+
+                kind = forward.WhichOneof('type')
+                if kind == 'delta' and forward.delta.WhichOneof('type') == 'new_element':
+                    element = forward.delta.new_element
+                    element_type = element.WhichOneof('type')
+                    if element_type in WIDGET_TYPES:
+                        self._record_widget(element_type, getattr(element, element_type))
+                elif kind == 'script_finished':
+                    return time.perf_counter() - start, received
+
+
+def interactions(session, rng):
+    """Yield ``(action, widget changes)`` for one pass of the interaction script.
+
+    With ``AIRISK_CLIENT_SELECTION=1`` the company selection is not a widget
+    and never reaches the server, so those steps are skipped.
+    """
+    client_selection = "Select Companies to Compare" not in session.widgets
+    if not client_selection:
+        companies = session.options("Select Companies to Compare")
+        yield 'select companies', {
+            "Select Companies to Compare": rng.sample(companies, rng.randint(1, len(companies)))
+        }
+    yield 'select category', {"Select Risk Category": rng.choice(session.options("Select Risk Category"))}
+    yield 'select sensitivity company', {"Select Company": rng.choice(session.options("Select Company"))}
+    if not client_selection:
+        yield 'select all companies', {"Select Companies to Compare": companies}
+
+
+class Recorder:
+    """Rerun latencies and payload sizes per (script, action)."""
+
+    def __init__(self):
+        self.latencies = defaultdict(list)
+        self.received = defaultdict(list)
+        self.errors = []
+
+    async def time(self, script, action, rerun):
+        elapsed, received = await rerun
+        self.latencies[script, action].append(elapsed)
+        self.received[script, action].append(received)
+
+
+async def run_session(url, script, iterations, think, timeout, rng, recorder):
+    try:
+        async with Session(url, PAGES[script], timeout) as session:
+            await recorder.time(script, 'initial load', session.rerun())
+            for _ in range(iterations):
+                for action, changes in interactions(session, rng):
+                    # Reading the page, switching tabs
+                    await asyncio.sleep(rng.expovariate(1 / think) if think else 0)
+                    await recorder.time(script, action, session.rerun(**changes))
+    except Exception as exc:
+        # A timed-out or dropped session ends early; report it with the rest
+        recorder.errors.append((script, exc))
+
+
+async def sample_rss(pid, samples, interval):
+    start = time.perf_counter()
+    while True:
+        await asyncio.sleep(interval)
+        samples.append((time.perf_counter() - start, rss_mb(pid)))
+
+
+async def run(args, pid):
+    recorder = Recorder()
+    samples = [(0.0, rss_mb(pid))] if pid else []
+    sampler = asyncio.create_task(sample_rss(pid, samples, args.sample_interval)) if pid else None
+
+    n_sessions = args.sessions * len(args.scripts)
+    print(f"Starting {n_sessions} sessions ({args.sessions} per script) against {args.url}")
+    start = time.perf_counter()
+    sessions = []
+    for i in range(args.sessions):
+        for script in args.scripts:
+            rng = random.Random(f"{args.seed}-{script}-{i}")
+            sessions.append(asyncio.create_task(
+                run_session(args.url, script, args.iterations, args.think, args.timeout, rng, recorder)
+            ))
+            await asyncio.sleep(args.ramp / n_sessions)
+    await asyncio.gather(*sessions)
+    elapsed = time.perf_counter() - start
+    if sampler:
+        sampler.cancel()
+    return recorder, elapsed, samples
+
+
+def report(recorder, elapsed, samples):
+    print(f"{'script':<28} {'action':<28} {'n':>5} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'kB':>8}")
+    all_latencies = []
+    for (script, action), latencies in sorted(recorder.latencies.items()):
+        all_latencies.extend(latencies)
+        p50, p95, p99 = 1000 * np.percentile(latencies, [50, 95, 99])
+        kb = np.mean(recorder.received[script, action]) / 1000
+        print(f"{script:<28} {action:<28} {len(latencies):>5} {p50:>8.1f} {p95:>8.1f} {p99:>8.1f} {kb:>8.1f}")
+
+    if all_latencies:
+        p50, p95, p99 = 1000 * np.percentile(all_latencies, [50, 95, 99])
+        print(f"{'all':<28} {'':<28} {len(all_latencies):>5} {p50:>8.1f} {p95:>8.1f} {p99:>8.1f}")
+    print(f"\nThroughput: {len(all_latencies) / elapsed:.1f} reruns/s over {elapsed:.1f}s")
+
+    samples = [(seconds, rss) for seconds, rss in samples if rss is not None]
+    if samples:
+        print("\nServer RSS over time:")
+        step = max(1, len(samples) // 10)
+        for seconds, rss in samples[::step]:
+            print(f"  {seconds:>6.1f}s {rss:>8.1f} MB")
+        print(f"  peak {max(rss for _, rss in samples):.1f} MB")
+
+    if recorder.errors:
+        print(f"\n{len(recorder.errors)} sessions failed, first: {recorder.errors[0]!r}")
+
+
+def launch_server(port):
+    """Start a headless server for the main page and wait until it is healthy."""
+    server = subprocess.Popen(
+        [
+            sys.executable, '-m', 'streamlit', 'run', 'AI_Risk_Dashboard.py',
+            '--server.headless', 'true', '--server.port', str(port),
+            '--browser.gatherUsageStats', 'false',
+        ],
+        cwd=ROOT,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if server.poll() is not None:
+            raise RuntimeError(f"streamlit exited with status {server.returncode}")
+        try:
+            with urllib.request.urlopen(f"http://localhost:{port}/_stcore/health", timeout=1):
+                return server
+        except OSError:
+            time.sleep(0.5)
+    server.terminate()
+    raise RuntimeError("streamlit did not become healthy within 60s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--url', help="server to test; by default a headless one is started")
+    parser.add_argument('--pid', type=int, help="server process id, for RSS samples with --url")
+    parser.add_argument('--port', type=int, default=8599, help="port for the started server")
+    parser.add_argument('--sessions', type=int, default=10, help="concurrent sessions per page script")
+    parser.add_argument('--iterations', type=int, default=3, help="passes of the interaction script per session")
+    parser.add_argument('--ramp', type=float, default=0.0, help="seconds over which sessions are started")
+    parser.add_argument('--think', type=float, default=1.0, help="mean seconds between a session's actions")
+    parser.add_argument('--scripts', nargs='+', default=list(PAGES), choices=list(PAGES))
+    parser.add_argument('--sample-interval', type=float, default=0.5, help="seconds between RSS samples")
+    parser.add_argument('--timeout', type=float, default=120.0, help="per-rerun timeout in seconds")
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    server = None
+    pid = args.pid
+    if args.url is None:
+        server = launch_server(args.port)
+        args.url, pid = f"http://localhost:{args.port}", server.pid
+    try:
+        report(*asyncio.run(run(args, pid)))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
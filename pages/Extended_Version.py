@@ -1,8 +1,14 @@
+from functools import partial
+
 import streamlit as st
-import pandas as pd
-from pathlib import Path
-import plotly.graph_objects as go
-from plotly.subplots import make_subplots
+
+import charts
+import company_selection
+from assets import logo_url, stylesheet_tag
+from cache_backend import cached
+from charts import COLOR_MAP
+from risk_data import load_risk_data
+from sensitivity import leave_one_out
 
 # ========== INITIAL SETUP ==========
 st.set_page_config(
@@ -13,151 +19,39 @@ st.set_page_config(
 )
 
 # ========== DATA LOADING ==========
-@st.cache_data
+# Cached as a shared resource: the frames are read-only, so every rerun and
+# session can use the same objects instead of receiving a fresh copy.
+# `cached` goes through the backend set by AIRISK_CACHE_BACKEND, which
+# replicas on one host can share (see cache_backend.py).
+@st.cache_resource
 def get_risk_data():
-    DATA_FILENAME1 = Path('data/risk_category_full.csv')
-    risk_category_df = pd.read_csv(DATA_FILENAME1)
-
-    DATA_FILENAME2 = Path('data/riskindicators_table_full.csv')
-    risk_indicator_df = pd.read_csv(DATA_FILENAME2)
+    return cached('risk_data', 'full', lambda: load_risk_data('full'))
 
-    DATA_FILENAME3 = Path('data/risk_company_full.csv')
-    risk_company_df = pd.read_csv(DATA_FILENAME3)
+@st.cache_resource
+def get_sensitivity():
+    return cached('sensitivity', 'full', lambda: leave_one_out(get_risk_data()))
 
-    return risk_category_df, risk_indicator_df, risk_company_df
-
-category_df, indicator_df, risk_company_df = get_risk_data()
-indicator_df['Risk ID'] = indicator_df['Risk ID'].astype(str)
-
-# ========== COLOR SCHEME ==========
-color_map = {
-    'Anthropic': '#da7756',
-    'Google DeepMind': '#4285F4',
-    'Meta AI': '#34b3f0',
-    'OpenAI': '#00A67E',
-    'xAI': '#000000'
-}
+risk_data = get_risk_data()
+company_scores = risk_data.company_scores
+company_names = risk_data.companies['name'].to_numpy()
 
 # ========== SIDEBAR ==========
 with st.sidebar:
     st.title("AI Risk Dashboard Extended Version")
     st.markdown("---")
     st.markdown("**Color Legend**")
-    for company, color in color_map.items():
+    for company, color in COLOR_MAP.items():
         st.markdown(f"<span style='color: {color};'>■</span> {company}", unsafe_allow_html=True)
 
 # ========== CUSTOM STYLES ==========
-st.markdown("""
-<style>
-    @import url('https://fonts.googleapis.com/css2?family=Roboto:wght@300;400;500;700&display=swap');
-    
-    * {
-        font-family: 'Roboto', sans-serif !important;
-    }
-    
-    .main .block-container {
-        padding-top: 1rem;
-        padding-bottom: 1rem;
-    }
-    
-    h1 {
-        color: #2c3e50;
-        font-size: 2.5rem;
-        margin-bottom: 0.5rem;
-    }
-    
-    h2 {
-        border-bottom: 2px solid #009edb;
-        padding-bottom: 0.3rem;
-        color: #2c3e50;
-        margin-top: 1.5rem;
-    }
-    
-    .metric-card {
-        background: #f8f9fa;
-        border-radius: 8px;
-        padding: 1rem;
-        margin: 1rem 0;
-        box-shadow: 0 2px 4px rgba(0,0,0,0.1);
-    }
-    
-    .stPlotlyChart {
-        border-radius: 8px;
-    }
-    
-    [data-testid="stTabs"] {
-        margin-top: 2rem;
-    }
-    
-    [data-testid="stTab"] {
-        padding: 15px 25px;
-        font-size: 1.2rem !important;
-        font-weight: 600 !important;
-        transition: all 0.3s ease;
-    }
-
-    [data-testid="stTab"]:hover {
-        background-color: #f0f2f6;
-    }
-
-    [aria-selected="true"] {
-        color: #009edb !important;
-        border-bottom: 3px solid #009edb !important;
-    }
-
-    .chart-header {
-        font-size: 1.4rem !important;
-        font-weight: 700 !important;
-        color: #2c3e50 !important;
-        margin-bottom: 1.5rem !important;
-    }
-
-    .dataframe th {
-        background-color: #009edb !important;
-        color: white !important;
-        font-size: 1.1rem !important;
-    }
-
-    .dataframe td {
-        font-size: 1rem !important;
-    }
-
-    .logo-container {
-        display: flex;
-        justify-content: space-between;
-        align-items: center;
-        margin-bottom: 2rem;
-    }
-    .logo-img {
-        max-height: 75px;
-        width: auto;
-    }
-    .quote-box {
-        border-left: 4px solid #009edb;
-        background-color: #f0f9ff;
-        padding: 1.5rem;
-        margin: 1.5rem 0;
-        border-radius: 4px;
-        color: #2c3e50;
-        position: relative;
-        min-height: 120px;
-    }
-    .attribution {
-        position: absolute;
-        bottom: 10px;
-        right: 20px;
-        font-style: normal;
-        font-size: 0.9em;
-        color: #6c757d;
-    }
-</style>
-""", unsafe_allow_html=True)
+# Served from static/ and cached by the browser; see assets.py
+st.markdown(stylesheet_tag(), unsafe_allow_html=True)
 
 # ========== MAIN CONTENT ==========
-st.markdown("""
+st.markdown(f"""
 <div class="logo-container">
-    <img src="https://upload.wikimedia.org/wikipedia/commons/c/c7/London_school_of_economics_logo_with_name.svg" class="logo-img" alt="LSE Logo">
-    <img src="https://unu.edu/sites/default/files/2023-03/UNU-CPR_LOGO_NV.svg" class="logo-img" alt="UNU Logo">
+    <img src="{logo_url('lse')}" class="logo-img" alt="LSE Logo">
+    <img src="{logo_url('unu')}" class="logo-img" alt="UNU Logo">
 </div>
 
 <div style="text-align: center; margin-bottom: 2rem;">
@@ -194,200 +88,115 @@ with st.expander("Understanding Risk Scores", expanded=False):
 
 gauge_container = st.container()
 with gauge_container:
-    cols = st.columns(len(risk_company_df))
-    for idx, (_, row) in enumerate(risk_company_df.iterrows()):
+    cols = st.columns(len(company_scores))
+    for idx, (company_id, score) in enumerate(zip(company_scores['company_id'], company_scores['score'])):
         with cols[idx]:
-            fig = go.Figure(go.Indicator(
-                mode="gauge+number",
-                value=row['Standardized Value'],
-                title={'text': f"{row['Company']}"},
-                gauge={
-                    'axis': {'range': [0, 100]},
-                    'bar': {'color': "whitesmoke"},
-                    'steps': [
-                        {'range': [0, 33], 'color': '#008450'},
-                        {'range': [33, 66], 'color': '#EFB700'},
-                        {'range': [66, 100], 'color': '#B81D13'}
-                    ],
-                    'threshold': {
-                        'line': {'color': 'whitesmoke', 'width': 4},
-                        'thickness': 0.69,
-                        'value': row['Standardized Value']
-                    }
-                }
-            ))
-            fig.update_layout(
-                width=300 * len(risk_company_df),
-                height=300,
-                margin=dict(t=0, b=0),
-                font={'family': 'Roboto', 'color': '#454545'}
-            )
+            fig = charts.gauge(company_names[company_id], score, len(company_scores))
             st.plotly_chart(fig, use_container_width=True)
 
 # ========== COMPARATIVE ANALYSIS ==========
 st.markdown("---")
 st.markdown("### Comparative Score Analysis")
 
-companies = category_df['Company'].unique()
-selected_companies = st.multiselect(
-    'Select Companies to Compare',
-    companies,
-    default=companies,
-    help="Choose companies to analyze their risk profiles"
-)
+companies = risk_data.companies.index
+if company_selection.ENABLED:
+    # Every chart carries all companies; the selection is applied in the
+    # browser without a rerun (see company_selection.py)
+    selected_company_ids = companies
+    company_selection.company_selector(
+        'Select Companies to Compare',
+        company_names,
+        help="Choose companies to analyze their risk profiles"
+    )
+    comparison_chart = partial(company_selection.plotly_chart, company_names=company_names)
+else:
+    selected_company_ids = st.multiselect(
+        'Select Companies to Compare',
+        companies,
+        default=companies,
+        format_func=lambda company_id: company_names[company_id],
+        help="Choose companies to analyze their risk profiles"
+    )
+    comparison_chart = partial(st.plotly_chart, use_container_width=True)
 
 tab1, tab2, tab3 = st.tabs(["📊 Score Comparisons", "🔍 Detailed Metrics", "📋 Tables"])
 
 with tab1:
     # Risk Category Comparison
     st.markdown('<div class="chart-header">Risk Category Comparison</div>', unsafe_allow_html=True)
-    fig = go.Figure()
-    
-    for company in selected_companies:
-        company_data = category_df[category_df['Company'] == company]
-        fig.add_trace(go.Scatterpolar(
-            r=company_data['Standardized Value'],
-            theta=company_data['Risk Category'].str.replace(r'\d+\.\s*', '', regex=True),
-            fill='toself',
-            name=company,
-            line=dict(color=color_map[company], width=2)
-        ))
-    
-    fig.update_layout(
-        polar=dict(
-            radialaxis=dict(range=[0, 100]),
-            angularaxis=dict(rotation=90)
-        ),
-        height=500,
-        legend=dict(orientation="h", yanchor="bottom", y=-0.3,
-            xanchor="center",x=0.5),
-        margin=dict(t=40)
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    fig = charts.category_radar(risk_data, selected_company_ids)
+    comparison_chart(fig)
 
     # Risk Indicator Comparison
     st.markdown("---")
     st.markdown('<div class="chart-header">Risk Indicator Comparison</div>', unsafe_allow_html=True)
-    categories = category_df['Risk Category'].unique()
-    
-    for category in categories:
-        category_data = indicator_df[indicator_df['Risk Category'] == category]
-        fig = go.Figure()
-        
-        for company in selected_companies:
-            company_data = category_data[category_data['Company'] == company]
-            fig.add_trace(go.Scatterpolar(
-                r=company_data['Standardized Value'],
-                theta=company_data['Risk Indicator'],
-                connectgaps=True,
-                fill='toself',
-                name=company,
-                line=dict(color=color_map[company]),
-                hoverlabel=dict(font={'family': 'Roboto'})
-            ))
-        
-        fig.update_layout(
-            polar=dict(
-                radialaxis=dict(range=[0, 100]),
-                angularaxis=dict(rotation=90)
-            ),
-            title=category,
-            legend=dict(orientation="h", yanchor="bottom", y=-0.3,
-            xanchor="center",x=0.5),
-            height=500,
-            margin=dict(t=60)
-        )
-        st.plotly_chart(fig, use_container_width=True)
+    for category_id in risk_data.categories.index:
+        fig = charts.indicator_radar(risk_data, category_id, selected_company_ids)
+        comparison_chart(fig)
 
 with tab2:
     st.markdown('<div class="chart-header">Company Comparison</div>', unsafe_allow_html=True)
     # Company-specific Radar Charts
-    if len(selected_companies) > 0:
-        fig = make_subplots(
-            rows=1, 
-            cols=len(selected_companies),
-            specs=[[{'type': 'polar'}]*len(selected_companies)],
-            subplot_titles=selected_companies
-        )
-        
-        for i, company in enumerate(selected_companies):
-            company_data = category_df[category_df['Company'] == company]
-            company_data = company_data.replace({
-                'Risk Category': {
-                    "1. Hypercompetitive behavior": "Hypercompetitive",
-                    "2. ​Lack of compliance and safety practices": "Lack of Safety",
-                    "3. Lack of commitment to emerging standards": "Lack of Commitment",
-                    "4. Incidents": "Incidents"
-                }
-            })
-            fig.add_trace(go.Scatterpolar(
-                r=company_data['Standardized Value'],
-                theta=company_data['Risk Category'],
-                connectgaps=True,
-                fill='toself',
-                line=dict(color=color_map[company]),
-                name=company
-            ), 1, i+1)
-        # Adjust the position of the subplot titles
-        for annotation in fig['layout']['annotations']:
-            annotation['y'] += 0.3 
-        
-        # Update the layout
-        for j in range(1, len(selected_companies) + 1):
-            fig.update_layout(**{f'polar{j}': dict(
-                radialaxis=dict(visible=True, range=[0, 100]),
-                angularaxis=dict(rotation=90))
-            })
-        
-        fig.update_layout(
-            width=200*len(selected_companies),
-            height=200 + 300/len(selected_companies),
-            showlegend=False,
-            font={'family': 'Roboto', 'color': '#454545'},
-            margin=dict(t=60)
-        )
-        st.plotly_chart(fig, use_container_width=True)
+    if len(selected_company_ids) > 0:
+        fig = charts.company_radars(risk_data, selected_company_ids)
+        comparison_chart(fig)
 
     # Detailed Metric Analysis
     st.markdown("---")
     st.markdown('<div class="chart-header">Detailed Risk Metrics</div>', unsafe_allow_html=True)
-    selected_category = st.selectbox(
+    selected_category_id = st.selectbox(
         "Select Risk Category",
-        category_df['Risk Category'].unique(),
+        risk_data.categories.index,
+        format_func=lambda category_id: risk_data.categories.at[category_id, 'name'],
         index=0
     )
     
-    category_data = indicator_df[indicator_df['Risk Category'] == selected_category]
-    fig = go.Figure()
-    
-    for company in selected_companies:
-        company_data = category_data[category_data['Company'] == company]
-        fig.add_trace(go.Bar(
-            x=company_data['Standardized Value'],
-            y=company_data['Risk Indicator'],
-            name=company,
-            orientation='h',
-            marker=dict(color=color_map[company])
-        ))
-    
-    fig.update_layout(
-        barmode='group',
-        height=500,
-        xaxis_title="Risk Score",
-        yaxis_title="Indicator",
-        margin=dict(l=150)
-    )
-    st.plotly_chart(fig, use_container_width=True)
+    fig = charts.indicator_bars(risk_data, selected_category_id, selected_company_ids)
+    comparison_chart(fig)
     with st.expander("Understanding Scoring Methodology", expanded=False):
         st.markdown("""
         The scoring method uses a min-max scaler to rate companies by risk. For each risk indicator, we take a company’s measurement, subtract by the lowest value across all companies, divide by the difference between the highest and lowest values, and multiply by 100. This gives a 0-100 score showing how the company compare to others.""")
 
+    # Leave-one-out Sensitivity
+    st.markdown("---")
+    st.markdown('<div class="chart-header">Sensitivity Analysis</div>', unsafe_allow_html=True)
+    sensitivity = get_sensitivity()
+    col1, col2 = st.columns(2)
+    with col1:
+        sensitivity_company_id = st.selectbox(
+            "Select Company",
+            risk_data.companies.index,
+            format_func=lambda company_id: company_names[company_id]
+        )
+    with col2:
+        sensitivity_level = st.radio(
+            "Leave out one",
+            ['indicators', 'categories'],
+            format_func={'indicators': 'Indicator', 'categories': 'Category'}.get,
+            horizontal=True
+        )
+    fig = charts.tornado(risk_data, sensitivity, sensitivity_company_id, sensitivity_level)
+    st.plotly_chart(fig, use_container_width=True)
+
+    flips = getattr(sensitivity, sensitivity_level)
+    flips = flips[flips['rank_flip'] & (flips['company_id'] == sensitivity_company_id)]
+    if len(flips):
+        st.warning(f"{len(flips)} of the {sensitivity_level} change "
+                   f"{company_names[sensitivity_company_id]}'s rank when left out (labelled in the chart).")
+    else:
+        st.success(f"Leaving out any single one of the {sensitivity_level} "
+                   f"does not change {company_names[sensitivity_company_id]}'s rank.")
+
+    with st.expander("Understanding Sensitivity Analysis", expanded=False):
+        st.markdown("""
+        Each bar shows how the company's overall risk index would move if one indicator (or category) were left out of the average. Red bars mean the index would rise, so that item was pulling the score down; green bars mean it would fall. Items labelled with a rank move would change the company's position relative to the others.""")
+
 with tab3:
     st.markdown('<div class="chart-header">Data Tables</div>', unsafe_allow_html=True)
     
     with st.expander("Company Data", expanded=True):
         st.dataframe(
-            risk_company_df,
+            risk_data.company_table,
             use_container_width=True,
             column_config={
                 "Standardized Value": st.column_config.ProgressColumn(
@@ -401,7 +210,7 @@ with tab3:
 
     with st.expander("Category Data", expanded=True):
         st.dataframe(
-            category_df,
+            risk_data.category_table,
             use_container_width=True,
             column_config={
                 "Standardized Value": st.column_config.ProgressColumn(
@@ -415,7 +224,7 @@ with tab3:
     
     with st.expander("Indicator Data", expanded=True):
         st.dataframe(
-            indicator_df,
+            risk_data.indicator_table,
             use_container_width=True,
             column_config={
                 "Standardized Value": st.column_config.ProgressColumn(
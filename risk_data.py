@@ -0,0 +1,228 @@
+"""Loading helpers for the AI Risk score tables.
+
+The CSV exports are read once per process into compact frames: the string
+dimensions (company, category, indicator, risk id) become int-coded
+categoricals and the 0-100 scores float32.  Raw measurements stay float64,
+since some reach 1e10, beyond float32's 7 significant digits.  Every backing
+array is flagged read-only, so the loaded frames can be shared between reruns
+and sessions without handing each of them a defensive copy.
+
+On top of those frames the loader builds a small star schema: company,
+category and indicator dimension tables keyed by dense integer ids (with the
+display labels worked out once, here) and score fact tables that only carry
+those ids.  Chart code looks labels up by id and never touches the raw strings.
+"""
+import hashlib
+import re
+from dataclasses import dataclass
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+DATA_DIR = Path(__file__).parent / 'data'
+
+# Category, indicator and company tables for each published variant
+DATASETS = {
+    'std': (
+        'risk_category_std.csv',
+        'riskindicators_table_std.csv',
+        'risk_company_std.csv',
+    ),
+    'full': (
+        'risk_category_full.csv',
+        'riskindicators_table_full.csv',
+        'risk_company_full.csv',
+    ),
+}
+
+# Short chart labels, keyed by the number that prefixes each category name
+CATEGORY_SHORT_LABELS = {
+    1: 'Hypercompetitive',
+    2: 'Lack of Safety',
+    3: 'Lack of Commitment',
+    4: 'Incidents',
+}
+
+# Bounded 0-100 score columns, safe to hold as float32; every other numeric
+# column keeps the source precision
+_SCORE_COLUMNS = {'Standardized Value'}
+
+_CATEGORY_NUMBER = re.compile(r'^(\d+)\.\s*')
+_ZERO_WIDTH = dict.fromkeys(map(ord, '\u200b\u200c\u200d\ufeff'))
+
+
+@dataclass(frozen=True)
+class RiskData:
+    """Dimension and fact tables for one dataset variant.
+
+    Dimension frames are indexed by a dense ``*_id`` starting at 0, so a label
+    lookup is a positional take: ``categories['label'].to_numpy()[ids]``.
+    The ``*_table`` frames are the source tables as loaded, for display.
+    Every column of every frame is backed by a read-only array.
+    """
+    companies: pd.DataFrame
+    categories: pd.DataFrame
+    indicators: pd.DataFrame
+    company_scores: pd.DataFrame
+    category_scores: pd.DataFrame
+    indicator_scores: pd.DataFrame
+    company_table: pd.DataFrame
+    category_table: pd.DataFrame
+    indicator_table: pd.DataFrame
+
+
+def _readonly(values):
+    values.flags.writeable = False
+    return values
+
+
+def _code_dtype(n_categories):
+    for dtype in (np.int8, np.int16, np.int32):
+        if n_categories < np.iinfo(dtype).max:
+            return dtype
+    return np.int64
+
+
+def _compact_column(column):
+    if pd.api.types.is_numeric_dtype(column):
+        dtype = np.float32 if column.name in _SCORE_COLUMNS else np.float64
+        values = _readonly(column.to_numpy(dtype=dtype, copy=True))
+        return pd.Series(values, name=column.name, copy=False)
+
+    # Categories keep the order of first appearance so `.unique()` and the
+    # chart traces come out in the same order as the source file.
+    categories = pd.Index(pd.unique(column.to_numpy(dtype=object)))
+    codes = categories.get_indexer(column.to_numpy(dtype=object))
+    codes = _readonly(codes.astype(_code_dtype(len(categories))))
+    values = pd.Categorical.from_codes(codes, categories=categories)
+    return pd.Series(values, name=column.name, copy=False)
+
+
+def compact_frame(df):
+    """Return a read-only copy of ``df`` with categorical and compact numeric columns."""
+    columns = {name: _compact_column(column) for name, column in df.items()}
+    return pd.DataFrame(columns, copy=False)
+
+
+def _readonly_column(values):
+    values = np.asarray(values)
+    if not np.issubdtype(values.dtype, np.number):
+        # Object dtype keeps the array as given; a string dtype would copy it
+        # into a writable one
+        values = values.astype(object)
+    values = _readonly(values.copy())
+    return pd.Series(values, dtype=values.dtype, copy=False)
+
+
+def _dimension(columns, key):
+    """Dimension frame from ``{name: values}``, indexed by a dense ``key``.
+
+    Every column is backed by a read-only array, like the fact tables, so a
+    write to a frame shared between sessions raises instead of leaking.
+    """
+    dimension = pd.DataFrame(
+        {name: _readonly_column(values) for name, values in columns.items()}, copy=False
+    )
+    dimension.index.name = key
+    return dimension
+
+
+def _keys(column, dimension_names):
+    """Re-key a categorical column against a dimension's names, as ints."""
+    lookup = pd.Index(dimension_names).get_indexer(column.cat.categories)
+    if (lookup < 0).any():
+        missing = column.cat.categories[lookup < 0].tolist()
+        raise ValueError(f"{column.name!r} values missing from dimension: {missing}")
+    keys = lookup.astype(_code_dtype(len(dimension_names)))[column.cat.codes]
+    return _readonly(keys)
+
+
+def _category_labels(name):
+    """Return the category number, long label and short label for ``name``."""
+    label = name.translate(_ZERO_WIDTH).strip()
+    match = _CATEGORY_NUMBER.match(label)
+    if match is None:
+        return 0, label, label
+    number = int(match.group(1))
+    label = label[match.end():]
+    return number, label, CATEGORY_SHORT_LABELS.get(number, label)
+
+
+def build_risk_data(category_df, indicator_df, company_df):
+    """Split the compact source frames into dimension and fact tables."""
+    companies = _dimension({'name': category_df['Company'].cat.categories}, 'company_id')
+    category_names = category_df['Risk Category'].cat.categories
+    numbers, labels, short_labels = zip(*map(_category_labels, category_names))
+    categories = _dimension(
+        {'number': numbers, 'label': labels, 'short_label': short_labels, 'name': category_names},
+        'category_id'
+    )
+
+    risk_ids = indicator_df['Risk ID']
+    first_rows = indicator_df.groupby(risk_ids.cat.codes, sort=True).head(1)
+    indicator_ids = first_rows['Risk ID'].astype(str).to_numpy()
+    indicator_names = first_rows['Risk Indicator'].astype(str).to_numpy()
+    indicators = _dimension(
+        {
+            'risk_id': indicator_ids,
+            'name': indicator_names,
+            'label': indicator_ids + ' ' + indicator_names,
+            'category_id': _keys(first_rows['Risk Category'], categories['name']),
+        },
+        'indicator_id'
+    )
+
+    company_scores = pd.DataFrame({
+        'company_id': _keys(company_df['Company'], companies['name']),
+        'score': company_df['Standardized Value'].to_numpy(),
+    }, copy=False)
+    category_scores = pd.DataFrame({
+        'category_id': _keys(category_df['Risk Category'], categories['name']),
+        'company_id': _keys(category_df['Company'], companies['name']),
+        'score': category_df['Standardized Value'].to_numpy(),
+    }, copy=False)
+    indicator_scores = pd.DataFrame({
+        'indicator_id': _keys(risk_ids, indicators['risk_id']),
+        'category_id': _keys(indicator_df['Risk Category'], categories['name']),
+        'company_id': _keys(indicator_df['Company'], companies['name']),
+        'value': indicator_df['Value'].to_numpy(),
+        'score': indicator_df['Standardized Value'].to_numpy(),
+    }, copy=False)
+
+    return RiskData(
+        companies=companies,
+        categories=categories,
+        indicators=indicators,
+        company_scores=company_scores,
+        category_scores=category_scores,
+        indicator_scores=indicator_scores,
+        company_table=company_df,
+        category_table=category_df,
+        indicator_table=indicator_df,
+    )
+
+
+def dataset_hash(variant='std', data_dir=DATA_DIR):
+    """Content hash of the CSV files ``variant`` is loaded from."""
+    digest = hashlib.sha256()
+    for filename in DATASETS[variant]:
+        digest.update((Path(data_dir) / filename).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def load_risk_data(variant='std', data_dir=DATA_DIR):
+    """Load the score tables for ``variant`` as a :class:`RiskData`."""
+    data_dir = Path(data_dir)
+    category_file, indicator_file, company_file = DATASETS[variant]
+
+    risk_category_df = pd.read_csv(data_dir / category_file)
+    # Read the ids as text so "2.10"-style ids are never parsed as floats
+    risk_indicator_df = pd.read_csv(data_dir / indicator_file, dtype={'Risk ID': str})
+    risk_company_df = pd.read_csv(data_dir / company_file)
+
+    return build_risk_data(
+        compact_frame(risk_category_df),
+        compact_frame(risk_indicator_df),
+        compact_frame(risk_company_df),
+    )